@@ -1,3 +1,3 @@
-from .telemetry import Telemetry
+from .telemetry import Telemetry, TelemetryPacket
 
-__all__ = ["Telemetry"]
+__all__ = ["Telemetry", "TelemetryPacket"]
@@ -0,0 +1,3 @@
+def compute_checksum(packet_bytes: bytes | bytearray | memoryview) -> int:
+    # slice through a memoryview so the body isn't copied
+    return sum(memoryview(packet_bytes)[:-1]) & 0xFF
@@ -1,12 +1,17 @@
+import os
+import queue
+import threading
 import time
-import math
 import logging
 import struct
 import serial
-from typing import Optional
+import numpy as np
+from typing import List, NamedTuple, Optional
 from PyQt6 import QtCore
 import json
 
+from ._checksum import compute_checksum
+
 PORT = "COM3"
 BAUD = 115200
 TIMEOUT = 1.0
@@ -16,17 +21,42 @@ END_MARKER = b"\x03"
 
 # header, timestamp, temp, pressure, altitude, crc
 TELEMETRY_PACKET_FORMAT = "<H I f f f B"
-PACKET_SIZE = struct.calcsize(TELEMETRY_PACKET_FORMAT)
+_PKT = struct.Struct(TELEMETRY_PACKET_FORMAT)
+_unpack = _PKT.unpack_from
+PACKET_SIZE = _PKT.size
+# start marker + packet + end marker
+FRAME_SIZE = PACKET_SIZE + 2
+
+# fake mode: altitude step, longitude step, latitude step, temperature, pressure
+FAKE_LOW = (1.0, -0.0001, -0.0001, 20.0, 1000.0)
+FAKE_HIGH = (2.0, 0.0001, 0.0001, 25.0, 1020.0)
+FAKE_BLOCK_SIZE = 1024
 
 logger = logging.getLogger(__name__)
 
 
+class TelemetryPacket(NamedTuple):
+    header: int
+    timestamp: int
+    temperature: float
+    pressure: float
+    altitude: float
+    crc: int
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    log: Optional[str] = None
+
+
 class Telemetry(QtCore.QObject):
-    telemetry = QtCore.pyqtSignal(dict)
     finished = QtCore.pyqtSignal()
 
     def __init__(
-        self, port: str, baud: int = 115200, timeout: float = 1.0, fake: bool = False
+        self,
+        port: str,
+        baud: int = 115200,
+        timeout: float = 1.0,
+        fake: bool = False,
+        realtime: bool = False,
     ):
         super().__init__()
         logger.info("Initializing Telemetry")
@@ -35,154 +65,179 @@ class Telemetry(QtCore.QObject):
         self.baud = baud
         self.timeout = timeout
         self.fake = fake
-        self._running = False
+        self.realtime = realtime
+        self._stop = threading.Event()
+        self._close_lock = threading.Lock()
         self._ser: Optional[serial.Serial] = None
+        # decoded packets for the GUI thread, which drains it on a timer
+        self.queue: "queue.SimpleQueue[TelemetryPacket]" = queue.SimpleQueue()
+        self._rng = np.random.default_rng()
 
     def fake_data(self):
-        import random
-
         logger.info("Starting fake data generation")
         alt = 0.0
         lon = 180.0
         lat = 90.0
         counter = 0
-        while self._running:
-            alt += random.uniform(1.0, 2.0)
-            lon += random.uniform(-0.0001, 0.0001)
-            lat += random.uniform(-0.0001, 0.0001)
+        block = self._rng.uniform(FAKE_LOW, FAKE_HIGH, (FAKE_BLOCK_SIZE, 5))
+        pos = 0
+        while not self._stop.is_set():
+            if pos == FAKE_BLOCK_SIZE:
+                block = self._rng.uniform(FAKE_LOW, FAKE_HIGH, (FAKE_BLOCK_SIZE, 5))
+                pos = 0
+            d_alt, d_lon, d_lat, temperature, pressure = block[pos].tolist()
+            pos += 1
+
+            alt += d_alt
+            lon += d_lon
+            lat += d_lat
             counter += 1
 
-            telemetry = {
-                "header": 0xABCD,
-                "timestamp": int(time.time()),
-                "temperature": random.uniform(20.0, 25.0),
-                "pressure": random.uniform(1000.0, 1020.0),
-                "altitude": alt,
-                "longitude": lon,
-                "latitude": lat,
-                "crc": 0,
-                "log": "",
-            }
-            log = json.dumps(telemetry)
-            telemetry["log"] = log
-            self.telemetry.emit(telemetry)
-            time.sleep(1.0)
-
-    def _compute_checksum(self, packet_bytes: bytes) -> int:
-        return sum(packet_bytes[:-1]) & 0xFF
-
-    def _read_exact(self, ser: serial.Serial, n: int) -> bytes:
-        buf = bytearray()
-        start = time.monotonic()
-        timeout = ser.timeout if ser.timeout is not None else math.inf
-        while len(buf) < n and self._running:
-            chunk = ser.read(n - len(buf))
-            if not chunk:
-                if (time.monotonic() - start) >= timeout:
-                    logger.error("Timeout while reading from serial")
-                continue
-            buf.extend(chunk)
-        if len(buf) < n:
-            logger.error("Timeout while reading exact bytes")
-        return bytes(buf)
+            telemetry = TelemetryPacket(
+                header=0xABCD,
+                timestamp=int(time.time()),
+                temperature=temperature,
+                pressure=pressure,
+                altitude=alt,
+                crc=0,
+                latitude=lat,
+                longitude=lon,
+            )
+            log = json.dumps(telemetry._asdict())
+            self.queue.put_nowait(telemetry._replace(log=log))
+            self._stop.wait(1.0)
+
+    def _compute_checksum(self, packet_bytes: bytes | bytearray | memoryview) -> int:
+        return compute_checksum(packet_bytes)
+
+    def _parse_frames(self, buf: bytearray) -> List[TelemetryPacket]:
+        """Decode every complete frame in buf and drop the consumed bytes.
+
+        A trailing partial frame is kept in buf for the next read.
+        """
+        packets: List[TelemetryPacket] = []
+        n = len(buf)
+        pos = 0
+        with memoryview(buf) as view:
+            while True:
+                i = buf.find(START_MARKER, pos)
+                if i < 0:
+                    pos = n
+                    break
+                if n - i < FRAME_SIZE:
+                    pos = i
+                    break
+
+                end = buf[i + FRAME_SIZE - 1]
+                if end != END_MARKER[0]:
+                    logger.warning(
+                        "Bad end marker (expected %s got %s), resyncing",
+                        END_MARKER,
+                        bytes((end,)),
+                    )
+                    pos = i + 1
+                    continue
+                pos = i + FRAME_SIZE
 
+                with view[i + 1 : i + 1 + PACKET_SIZE] as packet_bytes:
+                    received_crc = packet_bytes[-1]
+                    calc_crc = self._compute_checksum(packet_bytes)
+                if received_crc != calc_crc:
+                    logger.warning(
+                        "CRC mismatch: received=%02X calc=%02X, discarding packet",
+                        received_crc,
+                        calc_crc,
+                    )
+                    continue
+
+                packets.append(TelemetryPacket(*_unpack(buf, i + 1)))
+
+        del buf[:pos]
+        return packets
+
+    def _raise_thread_priority(self) -> None:
+        # Qt maps this to SetThreadPriority on Windows; Linux ignores it for
+        # normal threads, so pin the reader to one core and renice it there
+        thread = QtCore.QThread.currentThread()
+        if thread is not None:
+            thread.setPriority(QtCore.QThread.Priority.TimeCriticalPriority)
+
+        if hasattr(os, "sched_setaffinity"):
+            try:
+                cpu = max(os.sched_getaffinity(0))
+                os.sched_setaffinity(0, {cpu})
+                logger.info("Pinned telemetry reader to CPU %d", cpu)
+            except OSError as e:
+                logger.warning("Failed to pin telemetry reader: %s", e)
+            try:
+                os.nice(-5)
+            except OSError as e:
+                logger.warning("Failed to raise telemetry reader priority: %s", e)
+
+    @QtCore.pyqtSlot()
     def run(self):
+        if self.realtime:
+            self._raise_thread_priority()
+
         if self.fake:
-            self._running = True
             self.fake_data()
             self.finished.emit()
             return
 
         try:
             self._ser = serial.Serial(self.port, self.baud, timeout=self.timeout)
-            self._running = True
             logger.info("Opened serial port %s @ %d", self.port, self.baud)
+            # ASYNC_LOW_LATENCY on Linux drops the FTDI 16ms latency timer.
+            # pyserial only supports this on posix; on Windows the FTDI
+            # latency timer has to be lowered in the driver settings instead.
+            try:
+                self._ser.set_low_latency_mode(True)
+            except (AttributeError, NotImplementedError, ValueError) as e:
+                logger.debug("Low latency mode not available: %s", e)
         except Exception as e:
             self._ser = None
             logger.warning("Failed to open serial port %s: %s", self.port, e)
 
         ser = self._ser
+        buf = bytearray()
         try:
-            while self._running:
+            while not self._stop.is_set():
                 if ser is None:
                     return
 
-                b = ser.read(1)
-                logger.info(b)
-                if not b:
-                    continue
-                if b != START_MARKER:
-                    continue
-
-                try:
-                    packet_bytes = self._read_exact(ser, PACKET_SIZE)
-                except TimeoutError:
-                    logger.warning("Timeout reading packet body, resyncing")
-                    continue
-
-                end = ser.read(1)
-                if not end:
-                    logger.warning("Timeout reading end marker, resyncing")
-                    continue
-                if end != END_MARKER:
-                    logger.warning(
-                        "Bad end marker (expected %s got %s), resyncing",
-                        END_MARKER,
-                        end,
-                    )
-                    continue
-
-                received_crc = packet_bytes[-1]
-                calc_crc = self._compute_checksum(packet_bytes)
-                if received_crc != calc_crc:
-                    logger.warning(
-                        "CRC mismatch: received=%02X calc=%02X, discarding packet",
-                        received_crc,
-                        calc_crc,
-                    )
-                    continue
-
-                try:
-                    header, timestamp, temperature, pressure, altitude, crc = (
-                        struct.unpack(TELEMETRY_PACKET_FORMAT, packet_bytes)
-                    )
-                    telemetry = {
-                        "header": header,
-                        "timestamp": timestamp,
-                        "temperature": temperature,
-                        "pressure": pressure,
-                        "altitude": altitude,
-                        "crc": crc,
-                    }
-                    self.telemetry.emit(telemetry)
-                    # logger.info("Received Data: %s", altitude)
-                except struct.error as e:
-                    logger.error("Struct unpack error: %s", e)
+                # block until at least the rest of a frame is available so an
+                # idle line wakes the thread once per frame, not once per byte
+                chunk = ser.read(max(ser.in_waiting, FRAME_SIZE - len(buf), 1))
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Read %d bytes: %r", len(chunk), chunk)
+                if not chunk:
                     continue
+                buf += chunk
+                for packet in self._parse_frames(buf):
+                    self.queue.put_nowait(packet)
 
         except Exception as e:
-            logger.error("Serial reading error: %s", e)
+            # stop() closes the port under a blocked read, which raises here
+            if not self._stop.is_set():
+                logger.error("Serial reading error: %s", e)
 
         finally:
-            try:
-                if ser and ser.is_open:
-                    ser.close()
-                    ser = None
-                    self._ser = ser
-                    self._running = False
-                    logger.info("Closed open serial port")
+            self._close_serial()
+            self.finished.emit()
 
+    def _close_serial(self) -> None:
+        # run() and stop() may both get here from different threads
+        with self._close_lock:
+            ser, self._ser = self._ser, None
+            if ser is None:
+                return
+            try:
+                ser.close()
+                logger.info("Closed serial port")
             except Exception as e:
                 logger.error("Failed to Closed serial port: %s", e)
 
-            self.finished.emit()
-
     def stop(self):
         logger.info("Stopping Telemetry")
-        self._running = False
-        try:
-            if self._ser and self._ser.is_open:
-                self._ser.close()
-                logger.info("Closed serial port")
-        except Exception as e:
-            logger.error("Failed to Closed serial port: %s", e)
+        self._stop.set()
+        self._close_serial()
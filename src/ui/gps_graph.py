@@ -7,8 +7,21 @@ from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from mpl_toolkits.mplot3d import Axes3D
 
+from src.ui import gps_kernels
+from src.ui.gps_kernels import geodetic_to_enu_scalar
+
 logger = logging.getLogger(__name__)
 
+# initial number of trajectory points; the buffers double when full
+INITIAL_CAPACITY = 1024
+# the drawn trajectory is decimated to roughly this many vertices
+MAX_DRAWN_POINTS = 4000
+# ENU offsets are local (metres to a few km), so float32 is plenty for
+# storage and drawing; the ECEF reference math itself stays float64
+POSITION_DTYPE = np.float32
+# samples closer than this (L1, metres) to the previous one are dropped
+MIN_POINT_SPACING = 0.01
+
 
 class GPSGraph:
     def __init__(self) -> None:
@@ -18,14 +31,45 @@ class GPSGraph:
 
         self._trajectory_line: Optional[Any] = None
         self._current_point: Optional[Any] = None
-
-        self.positions_enu: List[Tuple[float, float, float]] = []
+        # scatter offsets for the newest point, written in place each refresh
+        self._px = np.empty(1, dtype=POSITION_DTYPE)
+        self._py = np.empty(1, dtype=POSITION_DTYPE)
+        self._pz = np.empty(1, dtype=POSITION_DTYPE)
+
+        # trajectory in ENU, one array per axis; only [:_n] is valid
+        self._cap = INITIAL_CAPACITY
+        self._n = 0
+        self._east = np.empty(self._cap, dtype=POSITION_DTYPE)
+        self._north = np.empty(self._cap, dtype=POSITION_DTYPE)
+        self._up = np.empty(self._cap, dtype=POSITION_DTYPE)
+        # running extents of the trajectory, used for the axis limits
+        self._reset_extents()
+        # last appended point, to drop stationary samples cheaply
+        self._last_enu: Tuple[float, float, float] = (math.inf, math.inf, math.inf)
 
         self.ref_lat: Optional[float] = None
         self.ref_lon: Optional[float] = None
         self.ref_alt: Optional[float] = None
         self.ref_set: bool = False
 
+        # reference ECEF and ECEF->ENU rotation, cached by _initialize_reference
+        self._ref_ecef: Optional[np.ndarray] = None
+        self._R_ecef2enu: Optional[np.ndarray] = None
+        self._sin_lat0: float = 0.0
+        self._cos_lat0: float = 1.0
+        self._sin_lon0: float = 0.0
+        self._cos_lon0: float = 1.0
+        self._ref_x: float = 0.0
+        self._ref_y: float = 0.0
+        self._ref_z: float = 0.0
+
+        # set when new points arrive, cleared once they have been drawn
+        self._dirty: bool = False
+
+        # axes background without the animated artists, for blitting
+        self._background: Optional[Any] = None
+        self._limits: Optional[Tuple[Any, Any, Any]] = None
+
     def setup_gps_graph(self) -> FigureCanvas:
         fig = Figure()
         canvas = FigureCanvas(fig)
@@ -37,19 +81,52 @@ class GPSGraph:
         self.ax.set_ylabel("North (m)")
         self.ax.set_zlabel("Up (m)")
         self.ax.set_title("Position Data")
+        canvas.mpl_connect("draw_event", self._on_draw)
         return canvas
 
+    def _draw_animated(self) -> None:
+        if self.ax is None:
+            return
+        if self._trajectory_line is not None:
+            self.ax.draw_artist(self._trajectory_line)
+        if self._current_point is not None:
+            # scatter offsets are only projected during a full axes draw
+            self._current_point.do_3d_projection()
+            self.ax.draw_artist(self._current_point)
+
+    def _on_draw(self, event: Any) -> None:
+        # a full redraw (new limits, rotation, resize) leaves the animated
+        # artists out, so grab the clean background and paint them on top
+        if self.canvas is None or self.ax is None:
+            return
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_animated()
+
+    def _blit(self) -> None:
+        if self.canvas is None or self.ax is None or self._background is None:
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.ax.bbox)
+
+    @staticmethod
+    def _padded_limits(
+        lo: float, hi: float, pad: float
+    ) -> Optional[Tuple[float, float]]:
+        lo, hi = float(lo), float(hi)
+        if not math.isfinite(lo) or not math.isfinite(hi):
+            return None
+        if abs(hi - lo) < 1e-6:
+            lo -= 1.0
+            hi += 1.0
+        return (lo - pad, hi + pad)
+
     def geodetic_to_ecef(
         self,
-        lat_deg: Sequence[float] | float,
-        lon_deg: Sequence[float] | float,
-        alt_m: Sequence[float] | float,
+        lat_deg: Sequence[float] | np.ndarray | float,
+        lon_deg: Sequence[float] | np.ndarray | float,
+        alt_m: Sequence[float] | np.ndarray | float,
     ) -> np.ndarray:
-        # WGS84 constants
-        a = 6378137.0
-        f = 1.0 / 298.257223563
-        e2 = f * (2.0 - f)
-
         lat_arr = np.asarray(lat_deg, dtype=float)
         lon_arr = np.asarray(lon_deg, dtype=float)
         alt_arr = np.asarray(alt_m, dtype=float)
@@ -57,23 +134,66 @@ class GPSGraph:
         # broadcast to same shape
         lat_arr, lon_arr, alt_arr = np.broadcast_arrays(lat_arr, lon_arr, alt_arr)
 
-        lat = np.deg2rad(lat_arr)
-        lon = np.deg2rad(lon_arr)
+        x, y, z = self._geodetic_to_ecef_numpy(lat_arr, lon_arr, alt_arr)
+
+        # fill (n,3) by column; stays C-contiguous, no transpose copy
+        ecef = np.empty((x.size, 3), dtype=np.float64)
+        ecef[:, 0] = x.ravel()
+        ecef[:, 1] = y.ravel()
+        ecef[:, 2] = z.ravel()
+        return ecef
+
+    @staticmethod
+    def _geodetic_to_ecef_scalar(
+        lat_deg: float, lon_deg: float, alt_m: float
+    ) -> Tuple[float, float, float]:
+        # single point (the reference) with math only; no numpy dispatch
+        lat = math.radians(lat_deg)
+        lon = math.radians(lon_deg)
+        sin_lat = math.sin(lat)
+        cos_lat = math.cos(lat)
+        N = gps_kernels.WGS84_A / math.sqrt(1.0 - gps_kernels.WGS84_E2 * sin_lat**2)
+        return (
+            (N + alt_m) * cos_lat * math.cos(lon),
+            (N + alt_m) * cos_lat * math.sin(lon),
+            (N * (1.0 - gps_kernels.WGS84_E2) + alt_m) * sin_lat,
+        )
+
+    @staticmethod
+    def _geodetic_to_ecef_numpy(
+        lat_arr: np.ndarray, lon_arr: np.ndarray, alt_arr: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        a = gps_kernels.WGS84_A
+        e2 = gps_kernels.WGS84_E2
+
+        # in-place ufuncs: each step reuses a buffer that is no longer
+        # needed rather than allocating a fresh temporary per operator
+        # (atleast_1d: ufuncs hand back scalars for 0-d input, and out= needs
+        # an array)
+        lat = np.atleast_1d(np.deg2rad(lat_arr))
+        lon = np.atleast_1d(np.deg2rad(lon_arr))
 
         sin_lat = np.sin(lat)
-        cos_lat = np.cos(lat)
+        cos_lat = np.cos(lat, out=lat)
         sin_lon = np.sin(lon)
-        cos_lon = np.cos(lon)
+        cos_lon = np.cos(lon, out=lon)
 
-        N = a / np.sqrt(1.0 - e2 * sin_lat * sin_lat)
+        # N = a / sqrt(1 - e2 * sin_lat^2)
+        N = np.multiply(sin_lat, sin_lat)
+        N *= -e2
+        N += 1.0
+        np.sqrt(N, out=N)
+        np.divide(a, N, out=N)
 
-        x = (N + alt_arr) * cos_lat * cos_lon
-        y = (N + alt_arr) * cos_lat * sin_lon
-        z = (N * (1.0 - e2) + alt_arr) * sin_lat
+        z = np.multiply(N, 1.0 - e2)
+        z += alt_arr
+        z *= sin_lat
 
-        # stack into (n,3)
-        ecef = np.vstack((x.ravel(), y.ravel(), z.ravel())).T
-        return ecef
+        N += alt_arr
+        N *= cos_lat
+        x = np.multiply(N, cos_lon, out=cos_lon)
+        y = np.multiply(N, sin_lon, out=sin_lon)
+        return x, y, z
 
     def ecef_to_enu(
         self,
@@ -118,34 +238,38 @@ class GPSGraph:
         else:
             alt0_val = float(alt0_m)
 
-        ref = self.geodetic_to_ecef(lat0_val, lon0_val, alt0_val)[0]
+        if (
+            self.ref_set
+            and self._ref_ecef is not None
+            and self._R_ecef2enu is not None
+            and (lat0_val, lon0_val, alt0_val)
+            == (self.ref_lat, self.ref_lon, self.ref_alt)
+        ):
+            # stored reference: reuse what _initialize_reference computed
+            ref = self._ref_ecef
+            R = self._R_ecef2enu
+        else:
+            ref = np.array(self._geodetic_to_ecef_scalar(lat0_val, lon0_val, alt0_val))
+            R = self._enu_rotation(math.radians(lat0_val), math.radians(lon0_val))
+
+        # ECEF vector relative to reference, rotated into ENU in one matmul
+        # instead of nine scaled column temporaries
+        d = np.subtract(ecef_pts_arr, ref)  # shape (n,3)
+        return np.matmul(d, R.T)
 
-        # Precompute trig
-        lat0 = math.radians(lat0_val)
-        lon0 = math.radians(lon0_val)
+    @staticmethod
+    def _enu_rotation(lat0: float, lon0: float) -> np.ndarray:
         sin_lat0 = math.sin(lat0)
         cos_lat0 = math.cos(lat0)
         sin_lon0 = math.sin(lon0)
         cos_lon0 = math.cos(lon0)
-
-        # ECEF vector relative to reference
-        d = ecef_pts_arr - ref  # shape (n,3)
-
-        # ENU conversion (vectorized)
-        east = -sin_lon0 * d[:, 0] + cos_lon0 * d[:, 1]
-        north = (
-            -sin_lat0 * cos_lon0 * d[:, 0]
-            - sin_lat0 * sin_lon0 * d[:, 1]
-            + cos_lat0 * d[:, 2]
+        return np.array(
+            [
+                [-sin_lon0, cos_lon0, 0.0],
+                [-sin_lat0 * cos_lon0, -sin_lat0 * sin_lon0, cos_lat0],
+                [cos_lat0 * cos_lon0, cos_lat0 * sin_lon0, sin_lat0],
+            ]
         )
-        up = (
-            cos_lat0 * cos_lon0 * d[:, 0]
-            + cos_lat0 * sin_lon0 * d[:, 1]
-            + sin_lat0 * d[:, 2]
-        )
-
-        enu = np.vstack((east, north, up)).T
-        return enu
 
     def _initialize_reference(self, lat: float, lon: float, alt: float) -> bool:
         if lat is None or lon is None or alt is None:
@@ -160,6 +284,19 @@ class GPSGraph:
             logger.exception("Failed to convert reference geodetic to float")
             return False
 
+        self._ref_x, self._ref_y, self._ref_z = self._geodetic_to_ecef_scalar(
+            self.ref_lat, self.ref_lon, self.ref_alt
+        )
+        self._ref_ecef = np.array((self._ref_x, self._ref_y, self._ref_z))
+
+        lat0 = math.radians(self.ref_lat)
+        lon0 = math.radians(self.ref_lon)
+        self._sin_lat0 = math.sin(lat0)
+        self._cos_lat0 = math.cos(lat0)
+        self._sin_lon0 = math.sin(lon0)
+        self._cos_lon0 = math.cos(lon0)
+        self._R_ecef2enu = self._enu_rotation(lat0, lon0)
+
         self.ref_set = True
         logger.info(
             "Reference geodetic set to lat=%s lon=%s alt=%s",
@@ -172,16 +309,93 @@ class GPSGraph:
     def set_reference(self, lat: float, lon: float, alt: float) -> bool:
         return self._initialize_reference(lat, lon, alt)
 
+    def _single_point_enu(
+        self, lat: float, lon: float, alt: float
+    ) -> Tuple[float, float, float]:
+        # scalar path for live samples; the vectorised geodetic_to_ecef and
+        # ecef_to_enu are kept for converting whole arrays at once
+        return geodetic_to_enu_scalar(
+            lat,
+            lon,
+            alt,
+            self._sin_lat0,
+            self._cos_lat0,
+            self._sin_lon0,
+            self._cos_lon0,
+            self._ref_x,
+            self._ref_y,
+            self._ref_z,
+        )
+
+    def ecef_to_enu_cached(self, ecef_pts: Sequence[float] | np.ndarray) -> np.ndarray:
+        # same as ecef_to_enu against the stored reference, using the cached
+        # reference ECEF and rotation instead of recomputing them
+        if self._ref_ecef is None or self._R_ecef2enu is None:
+            raise ValueError("Reference geodetic must be set before conversion.")
+        d = np.atleast_2d(np.asarray(ecef_pts, dtype=float)) - self._ref_ecef
+        return d @ self._R_ecef2enu.T
+
+    def _reset_extents(self) -> None:
+        self._xmin = math.inf
+        self._xmax = -math.inf
+        self._ymin = math.inf
+        self._ymax = -math.inf
+        self._zmin = math.inf
+        self._zmax = -math.inf
+
+    def _grow(self) -> None:
+        n = self._n
+        self._cap *= 2
+        for name in ("_east", "_north", "_up"):
+            old = getattr(self, name)
+            new = np.empty(self._cap, dtype=POSITION_DTYPE)
+            new[:n] = old[:n]
+            setattr(self, name, new)
+
     def _update_plot_with_new_point(self, enu_point: Sequence[float]) -> None:
-        enu_arr = np.asarray(enu_point, dtype=float).ravel()
-        if enu_arr.size != 3:
+        if len(enu_point) != 3:
             logger.error("enu_point must be of length 3")
             return
 
-        # Append point to stored list
-        self.positions_enu.append(
-            (float(enu_arr[0]), float(enu_arr[1]), float(enu_arr[2]))
+        # Append point to the buffers; drawing is left to refresh()
+        if self._n == self._cap:
+            self._grow()
+        east, north, up = enu_point
+        self._last_enu = (east, north, up)
+        i = self._n
+        self._east[i] = east
+        self._north[i] = north
+        self._up[i] = up
+        self._n = i + 1
+
+        # a new point can only widen the extents
+        if east < self._xmin:
+            self._xmin = east
+        if east > self._xmax:
+            self._xmax = east
+        if north < self._ymin:
+            self._ymin = north
+        if north > self._ymax:
+            self._ymax = north
+        if up < self._zmin:
+            self._zmin = up
+        if up > self._zmax:
+            self._zmax = up
+        self._dirty = True
+
+    def _new_current_point(self, ax: Axes3D) -> Any:
+        point = ax.scatter(
+            self._px, self._py, self._pz, color="red", s=10, animated=True
         )
+        # scatter copies its inputs; point it back at the shared arrays so
+        # later refreshes only have to write into them
+        point._offsets3d = (self._px, self._py, self._pz)
+        return point
+
+    def refresh(self) -> None:
+        if not self._dirty or self._n == 0:
+            return
+        self._dirty = False
 
         if self.ax is None:
             logger.warning(
@@ -189,102 +403,76 @@ class GPSGraph:
             )
             return
 
-        pts = np.array(self.positions_enu)
-        x = pts[:, 0]
-        y = pts[:, 1]
-        z = pts[:, 2]
-
+        x = self._east[: self._n]
+        y = self._north[: self._n]
+        z = self._up[: self._n]
+
+        # thin out long tracks for drawing, keeping the newest point; the
+        # full trajectory stays in the buffers
+        stride = max(1, self._n // MAX_DRAWN_POINTS)
+        start = (self._n - 1) % stride
+        line_x = x[start::stride]
+        line_y = y[start::stride]
+        line_z = z[start::stride]
+        self._px[0] = x[-1]
+        self._py[0] = y[-1]
+        self._pz[0] = z[-1]
+
+        # the line and scatter are created once and only mutated afterwards
         if self._trajectory_line is None:
-            lines = self.ax.plot(x, y, z, color="blue", linewidth=1)
+            lines = self.ax.plot(
+                line_x, line_y, line_z, color="blue", linewidth=1, animated=True
+            )
             if lines:
                 self._trajectory_line = lines[0]
             else:
                 logger.warning("ax.plot returned no lines")
-            self._current_point = self.ax.scatter(
-                [x[-1]],
-                [y[-1]],
-                [z[-1]],
-                color="red",
-                s=10,
-            )
             # try:
             #     self.ax.legend()
             # except Exception:
             #     pass
         else:
             try:
-                self._trajectory_line.set_data(x, y)
-
-                self._trajectory_line.set_3d_properties(z)
+                self._trajectory_line.set_data(line_x, line_y)
+                self._trajectory_line.set_3d_properties(line_z)
             except Exception:
-                logger.exception(
-                    "Failed to update trajectory line data; attempting to recreate line."
-                )
-                try:
-                    self._trajectory_line.remove()
-                except Exception:
-                    logger.debug("Failed to remove old trajectory line", exc_info=True)
-                lines = self.ax.plot(
-                    x, y, z, color="blue", linewidth=1.5, label="trajectory"
-                )
-                self._trajectory_line = lines[0] if lines else None
-
-            if self._current_point is not None:
-                try:
-                    self._current_point._offsets3d = (
-                        np.array([x[-1]]),
-                        np.array([y[-1]]),
-                        np.array([z[-1]]),
-                    )
-                except Exception:
-                    logger.debug(
-                        "Failed to update current point offsets; recreating scatter.",
-                        exc_info=True,
-                    )
-                    try:
-                        self._current_point.remove()
-                    except Exception:
-                        logger.debug(
-                            "Failed to remove old current point", exc_info=True
-                        )
-                    self._current_point = self.ax.scatter(
-                        [x[-1]], [y[-1]], [z[-1]], color="red", s=30
-                    )
-            else:
-                self._current_point = self.ax.scatter(
-                    [x[-1]], [y[-1]], [z[-1]], color="red", s=30
-                )
+                # leave the artist alone and retry on the next tick
+                logger.exception("Failed to update trajectory line data")
+                self._dirty = True
+                return
+
+        # the scatter's offsets alias _px/_py/_pz, already written above
+        if self._current_point is None:
+            self._current_point = self._new_current_point(self.ax)
 
         pad = 1.0  # meters
-        try:
-            xmin, xmax = float(np.min(x)), float(np.max(x))
-            if not math.isfinite(xmin) or not math.isfinite(xmax):
-                pass
-            else:
-                if abs(xmax - xmin) < 1e-6:
-                    xmin -= 1.0
-                    xmax += 1.0
-                self.ax.set_xlim(xmin - pad, xmax + pad)
-
-            ymin, ymax = float(np.min(y)), float(np.max(y))
-            if math.isfinite(ymin) and math.isfinite(ymax):
-                if abs(ymax - ymin) < 1e-6:
-                    ymin -= 1.0
-                    ymax += 1.0
-                self.ax.set_ylim(ymin - pad, ymax + pad)
-
-            zmin, zmax = float(np.min(z)), float(np.max(z))
-            if math.isfinite(zmin) and math.isfinite(zmax):
-                if abs(zmax - zmin) < 1e-6:
-                    zmin -= 1.0
-                    zmax += 1.0
-                self.ax.set_zlim(zmin - pad, zmax + pad)
-        except Exception:
-            logger.exception("Failed to set axis limits.")
+        limits = (
+            self._padded_limits(self._xmin, self._xmax, pad),
+            self._padded_limits(self._ymin, self._ymax, pad),
+            self._padded_limits(self._zmin, self._zmax, pad),
+        )
+        # only a change of limits needs the axes, ticks and panes redrawn;
+        # otherwise blit the artists over the saved background
+        full_redraw = self._background is None or limits != self._limits
+        if limits != self._limits:
+            self._limits = limits
+            xlim, ylim, zlim = limits
+            try:
+                if xlim is not None:
+                    self.ax.set_xlim(*xlim)
+                if ylim is not None:
+                    self.ax.set_ylim(*ylim)
+                if zlim is not None:
+                    self.ax.set_zlim(*zlim)
+            except Exception:
+                logger.exception("Failed to set axis limits.")
 
         if self.canvas is not None:
             try:
-                self.canvas.draw_idle()
+                if full_redraw:
+                    self.canvas.draw_idle()
+                else:
+                    self._blit()
             except Exception:
                 logger.exception("Failed to redraw canvas")
 
@@ -308,16 +496,23 @@ class GPSGraph:
             logger.exception("Invalid geodetic values in telemetry")
             return
 
-        ecef = self.geodetic_to_ecef(latf, lonf, altf)  # shape (1,3)
-        enu = self.ecef_to_enu(
-            ecef, self.ref_lat, self.ref_lon, self.ref_alt
-        )  # shape (1,3)
-        enu_point = enu[0]
-
-        self._update_plot_with_new_point(enu_point)
+        enu = self._single_point_enu(latf, lonf, altf)
+        last = self._last_enu
+        if (
+            abs(enu[0] - last[0]) + abs(enu[1] - last[1]) + abs(enu[2] - last[2])
+            < MIN_POINT_SPACING
+        ):
+            # stationary (e.g. on the pad): nothing new to draw
+            return
+        self._update_plot_with_new_point(enu)
 
     def clear(self) -> None:
-        self.positions_enu.clear()
+        self._n = 0
+        self._reset_extents()
+        self._last_enu = (math.inf, math.inf, math.inf)
+        self._dirty = False
+        self._background = None
+        self._limits = None
         if self.ax is not None:
             try:
                 if self._trajectory_line is not None:
@@ -343,4 +538,11 @@ class GPSGraph:
                 logger.exception("Error while clearing plot")
 
     def get_positions(self) -> List[Tuple[float, float, float]]:
-        return list(self.positions_enu)
+        n = self._n
+        return list(
+            zip(
+                self._east[:n].tolist(),
+                self._north[:n].tolist(),
+                self._up[:n].tolist(),
+            )
+        )
@@ -0,0 +1,48 @@
+import math
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        # numba is optional; without it the kernels run as plain python
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+# WGS84 constants
+WGS84_A = 6378137.0
+WGS84_F = 1.0 / 298.257223563
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)
+
+
+# explicit signature compiles (or loads from cache) at import instead of on
+# the first GPS sample
+_REF_SIG = "f8, f8, f8, f8, f8, f8, f8"
+
+
+@njit(f"UniTuple(f8, 3)(f8, f8, f8, {_REF_SIG})", cache=True, fastmath=True)
+def geodetic_to_enu_scalar(
+    lat, lon, alt, sin_lat0, cos_lat0, sin_lon0, cos_lon0, ref_x, ref_y, ref_z
+):
+    lat_r = math.radians(lat)
+    lon_r = math.radians(lon)
+    sin_lat = math.sin(lat_r)
+    cos_lat = math.cos(lat_r)
+    sin_lon = math.sin(lon_r)
+    cos_lon = math.cos(lon_r)
+
+    N = WGS84_A / math.sqrt(1.0 - WGS84_E2 * sin_lat * sin_lat)
+    dx = (N + alt) * cos_lat * cos_lon - ref_x
+    dy = (N + alt) * cos_lat * sin_lon - ref_y
+    dz = (N * (1.0 - WGS84_E2) + alt) * sin_lat - ref_z
+
+    east = -sin_lon0 * dx + cos_lon0 * dy
+    north = -sin_lat0 * cos_lon0 * dx - sin_lat0 * sin_lon0 * dy + cos_lat0 * dz
+    up = cos_lat0 * cos_lon0 * dx + cos_lat0 * sin_lon0 * dy + sin_lat0 * dz
+    return east, north, up
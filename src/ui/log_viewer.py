@@ -1,23 +1,28 @@
+from collections import deque
+from typing import Deque
 from PyQt6.QtWidgets import QHBoxLayout
 from PyQt6.QtWidgets import QWidget
-from collections import deque
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QTextCursor
 from PyQt6.QtWidgets import QTextEdit
 
 
 class LogViewer:
     def __init__(self, max_lines=1000) -> None:
         self.max_lines = max_lines
-        self.lines = deque(maxlen=self.max_lines)
         self.parent = QWidget()
         self.text = QTextEdit()
+        # number of text blocks each shown message occupies, newest first
+        self._message_blocks: Deque[int] = deque()
 
     def setup_log_viewer(self) -> QWidget:
         layout = QHBoxLayout()
         layout.setSpacing(0)
         layout.setContentsMargins(0, 0, 0, 0)
         self.text.setReadOnly(True)
+        # no undo history for a read-only view that is edited on every line
+        self.text.setUndoRedoEnabled(False)
         mono = QFont("Courier New")
         mono.setStyleHint(QFont.StyleHint.Monospace)
         mono.setPointSize(10)
@@ -34,8 +39,34 @@ class LogViewer:
         return self.parent
 
     def add_log(self, message: str):
-        self.lines.appendleft(message)
-        self.text.setPlainText("\n".join(self.lines))
+        # newest line goes on top, so insert at the start and trim the
+        # oldest lines off the bottom instead of rebuilding the whole text
+        document = self.text.document()
+        if document is None:
+            return
+        cursor = QTextCursor(document)
+        cursor.movePosition(QTextCursor.MoveOperation.Start)
+        first = not self._message_blocks
+        before = document.blockCount()
+        cursor.insertText(message if first else message + "\n")
+        # an empty document already has one block, which the first message fills
+        added = document.blockCount() if first else document.blockCount() - before
+        self._message_blocks.appendleft(added)
+
+        # drop whole messages off the bottom; each pass removes one entry
+        # from _message_blocks, so the loop always terminates
+        while len(self._message_blocks) > self.max_lines:
+            n = self._message_blocks.pop()
+            if not self._message_blocks:
+                document.clear()
+                break
+            # from the separator before the oldest message to the end
+            block = document.findBlockByNumber(document.blockCount() - n)
+            cursor.setPosition(block.position() - 1)
+            cursor.movePosition(
+                QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor
+            )
+            cursor.removeSelectedText()
 
         sb = self.text.verticalScrollBar()
         if sb is not None:
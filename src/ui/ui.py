@@ -1,10 +1,9 @@
 from PyQt6.QtGui import QFont
 from PyQt6.QtGui import QCloseEvent
 import logging
+import queue
 from PyQt6 import QtCore
-from typing import Optional
-import numpy as np
-import math
+from typing import List, Optional
 
 from PyQt6.QtWidgets import QHBoxLayout
 from PyQt6.QtWidgets import QCheckBox
@@ -13,7 +12,6 @@ from PyQt6.QtWidgets import QFormLayout
 from PyQt6.QtWidgets import QGridLayout
 import sys
 from PyQt6.QtWidgets import (
-    QApplication,
     QMainWindow,
     QMenuBar,
     QMenu,
@@ -23,20 +21,15 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QWidget,
     QStatusBar,
-    QMessageBox,
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSlot
 from PyQt6.QtGui import QIcon, QPixmap
 from PyQt6.QtGui import QAction
 
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-from mpl_toolkits.mplot3d import Axes3D  # noqa: F401
-
 from PyQt6.QtGui import QColor, QPalette
 
 from src.ui.value_grid import ValueGrid
-from src.telemetry import Telemetry
+from src.telemetry import Telemetry, TelemetryPacket
 from src.ui.gps_graph import GPSGraph
 from src.ui.log_viewer import LogViewer
 
@@ -54,9 +47,6 @@ class Color(QWidget):
 
 
 class MainWindow(QMainWindow):
-    # Custom signal for communication between widgets
-    data_updated = pyqtSignal(str)
-
     def __init__(self, telemetry: Telemetry):
         super().__init__()
         logger.info("Initializing MainWindow")
@@ -65,40 +55,34 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1600, 900)
         self.status_bar = self.statusBar()
         self.telemetry = telemetry
-        self.received_data: Optional[dict] = None
+        self.received_data: Optional[TelemetryPacket] = None
+        # latest packet and log lines not yet shown; rendered by _refresh_timer
+        self._pending_telemetry: Optional[TelemetryPacket] = None
+        self._pending_logs: List[str] = []
 
         self.graph_widget = GPSGraph()
         self.log_viewer_widget = LogViewer(max_lines=100)
         self.data_grid_widget = ValueGrid()
 
         # Initialize UI components
-        self._create_menu_bar()
-        self._create_toolbar()
-        self._create_status_bar()
         self._create_central_widget()
 
-        # Connect signals
-        self.data_updated.connect(self._on_data_updated)
-        self.telemetry.telemetry.connect(self.on_new_telemetry)
-
         # Set initial status
         if self.status_bar is not None:
             self.status_bar.showMessage("Ready")
 
-        self._refresh_timer = QtCore.QTimer(self)
-        self._refresh_timer.start(100)
+        # the reader thread only fills telemetry.queue; drain it from here
+        self._drain_timer = QtCore.QTimer(self)
+        self._drain_timer.timeout.connect(self._drain_telemetry)
+        self._drain_timer.start(10)
 
-    def _create_menu_bar(self):
-        """Create the main menu bar with actions"""
-        pass
-
-    def _create_toolbar(self):
-        """Create the toolbar with buttons"""
-        pass
-
-    def _create_status_bar(self):
-        """Create the status bar"""
-        pass
+        # redraws are driven by this timer, not by incoming telemetry
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._refresh_timer.setInterval(100)
+        self._refresh_timer.timeout.connect(self._flush_telemetry)
+        self._refresh_timer.timeout.connect(self.graph_widget.refresh)
+        self._refresh_timer.start()
 
     def _create_central_widget(self):
         """Create the main content area"""
@@ -176,75 +160,63 @@ class MainWindow(QMainWindow):
         widget.setLayout(outerLayout)
         self.setCentralWidget(widget)
 
-    @QtCore.pyqtSlot(dict)
-    def on_new_telemetry(self, telemetry: dict):
-        # Update labels
-        try:
-            self.data_grid_widget.update_telemetry(
-                "A0", str(telemetry.get("temperature", ""))
-            )
-            self.data_grid_widget.update_telemetry(
-                "A1", str(telemetry.get("pressure", ""))
-            )
-            self.data_grid_widget.update_telemetry(
-                "A2", str(telemetry.get("altitude", ""))
-            )
-            self.data_grid_widget.update_telemetry(
-                "B0", str(telemetry.get("temperature", ""))
-            )
-            self.data_grid_widget.update_telemetry(
-                "B1", str(telemetry.get("pressure", ""))
-            )
-            self.data_grid_widget.update_telemetry(
-                "B2", str(telemetry.get("altitude", ""))
-            )
-            self.data_grid_widget.update_telemetry(
-                "C0", str(telemetry.get("temperature", ""))
-            )
-            self.data_grid_widget.update_telemetry(
-                "C1", str(telemetry.get("pressure", ""))
-            )
-            self.data_grid_widget.update_telemetry(
-                "C2", str(telemetry.get("altitude", ""))
-            )
-            # self.received_data = telemetry
-            # self.temperature.setText(str(telemetry.get("temperature", "")))
-            # self.pressure.setText(str(telemetry.get("pressure", "")))
-            # self.altitude.setText(
-            #     str(telemetry.get("altitude", telemetry.get("alt", "")))
-            # )
-        except Exception:
-            logger.exception("Failed to update telemetry labels")
-
-        self.graph_widget.update_gps_graph(
-            telemetry.get("latitude", telemetry.get("lat", None)),
-            telemetry.get("longitude", telemetry.get("lon", None)),
-            telemetry.get(
-                "altitude", telemetry.get("alt", telemetry.get("elevation", None))
-            ),
+    @pyqtSlot()
+    def _drain_telemetry(self):
+        packets: List[TelemetryPacket] = []
+        while True:
+            try:
+                packets.append(self.telemetry.queue.get_nowait())
+            except queue.Empty:
+                break
+        self.on_new_telemetry(packets)
+
+    def on_new_telemetry(self, packets: List[TelemetryPacket]):
+        if not packets:
+            return
+
+        # only store here; labels and log are rendered at most once per
+        # _refresh_timer tick, with the latest packet winning
+        self._pending_telemetry = packets[-1]
+        # bound once for the loop, which runs for every packet
+        update_gps_graph = self.graph_widget.update_gps_graph
+        append_log = self._pending_logs.append
+        for packet in packets:
+            update_gps_graph(packet.latitude, packet.longitude, packet.altitude)
+            append_log(packet.log or "No log message")
+
+    @pyqtSlot()
+    def _flush_telemetry(self):
+        telemetry, self._pending_telemetry = self._pending_telemetry, None
+        logs, self._pending_logs = self._pending_logs, []
+        if telemetry is None:
+            return
+
+        temperature = telemetry.temperature
+        pressure = telemetry.pressure
+        altitude = telemetry.altitude
+        self.data_grid_widget.update_many(
+            {
+                "A0": temperature,
+                "A1": pressure,
+                "A2": altitude,
+                "B0": temperature,
+                "B1": pressure,
+                "B2": altitude,
+                "C0": temperature,
+                "C1": pressure,
+                "C2": altitude,
+            }
         )
+        # self.received_data = telemetry
+        # self.temperature.setText(str(telemetry.get("temperature", "")))
+        # self.pressure.setText(str(telemetry.get("pressure", "")))
+        # self.altitude.setText(
+        #     str(telemetry.get("altitude", telemetry.get("alt", "")))
+        # )
 
-        self.log_viewer_widget.add_log(telemetry.get("log", "No log message"))
-
-    def _button_clicked(self):
-        # """Handle main button click"""
-        # self.data_updated.emit("Button clicked!")
-        pass
-
-    def _custom_button_clicked(self):
-        # """Handle custom toolbar button click"""
-        # self.statusBar().showMessage("Custom button clicked")
-        pass
-
-    def _on_data_updated(self, message):
-        # """Handle custom signal"""
-        # self.statusBar().showMessage(message)
-        pass
-
-    def _show_about(self):
-        # """Show about dialog"""
-        # QMessageBox.about(self, "About", "Qt6 Python App Template\n\nA basic PyQt6 application template.")
-        pass
+        # lines beyond what the viewer keeps would be trimmed straight away
+        for log in logs[-self.log_viewer_widget.max_lines :]:
+            self.log_viewer_widget.add_log(log)
 
     # pyrefly: ignore[bad-param-name-override]
     def closeEvent(self, event: QCloseEvent):
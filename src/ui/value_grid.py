@@ -1,5 +1,6 @@
-from typing import Optional, Dict, Union
-from PyQt6.QtWidgets import QWidget, QGridLayout, QLabel, QSizePolicy
+import sys
+from typing import Optional, Dict, Tuple, Union
+from PyQt6.QtWidgets import QWidget, QGridLayout, QLabel, QSizePolicy, QVBoxLayout
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
 
@@ -27,20 +28,36 @@ class ValueGrid:
             "C1": 0.0,
             "C2": 0.0,
         }
-        self._labels: Dict[str, QLabel] = {}
+        # interned so the hot-path dict lookups can match on identity
+        self._keys: Tuple[str, ...] = tuple(sys.intern(k) for k in self.telemetry_data)
+        # (value label, unit label) per cell
+        self._labels: Dict[str, Tuple[QLabel, QLabel]] = {}
+        # text each label currently shows, to skip setText when unchanged
+        self._last_text: Dict[str, str] = {}
+        self._last_unit: Dict[str, str] = {}
 
         self.precision = int(precision)
         self.default_unit = default_unit
-        self.units = units.copy() if units else {}
+        self.units = self._intern_units(units) if units else {}
         self.per_key_precision = per_key_precision.copy() if per_key_precision else {}
         self.max_number_chars = int(max_number_chars)  # NEW
+        # fixed-point format spec per key, e.g. ".2f"; rebuilt when the
+        # precision changes
+        self._spec: Dict[str, str] = {}
+        # magnitudes outside [lower, upper) switch to scientific notation
+        self._upper_thresh = 10.0**self.max_number_chars
+        self._lower_thresh: Dict[str, float] = {}
 
     def set_precision(self, precision: int) -> None:
         self.precision = int(precision)
+        self._spec.clear()
+        self._lower_thresh.clear()
         self._refresh_all_labels()
 
     def set_precision_for_key(self, key: str, precision: int) -> None:
         self.per_key_precision[key] = int(precision)
+        self._spec.pop(key, None)
+        self._lower_thresh.pop(key, None)
         self._refresh_label(key)
 
     def set_default_unit(self, unit: str) -> None:
@@ -48,77 +65,86 @@ class ValueGrid:
         self._refresh_all_labels()
 
     def set_unit_for_key(self, key: str, unit: str) -> None:
-        self.units[key] = unit
+        self.units[sys.intern(key)] = sys.intern(unit)
         self._refresh_label(key)
 
     def set_units(self, units: Dict[str, str]) -> None:
-        self.units = units.copy()
+        self.units = self._intern_units(units)
         self._refresh_all_labels()
 
+    @staticmethod
+    def _intern_units(units: Dict[str, str]) -> Dict[str, str]:
+        return {sys.intern(k): sys.intern(v) for k, v in units.items()}
+
     def set_max_number_chars(self, n: int) -> None:
         self.max_number_chars = int(n)
+        self._upper_thresh = 10.0**self.max_number_chars
         self._refresh_all_labels()
 
     def _get_precision_for_key(self, key: str) -> int:
-        return int(self.per_key_precision.get(key, self.precision))
+        # both are stored as int already
+        return self.per_key_precision.get(key, self.precision)
+
+    def _get_spec_for_key(self, key: str) -> str:
+        spec = self._spec.get(key)
+        if spec is None:
+            spec = self._spec[key] = f".{self._get_precision_for_key(key)}f"
+        return spec
+
+    def _get_lower_thresh_for_key(self, key: str) -> float:
+        thresh = self._lower_thresh.get(key)
+        if thresh is None:
+            thresh = self._lower_thresh[key] = 10.0 ** -(
+                self._get_precision_for_key(key) + 2
+            )
+        return thresh
 
     def _get_unit_for_key(self, key: str) -> str:
         return self.units.get(key, self.default_unit)
 
     def _shorten_number_text(
-        self, raw_text: str, numeric_value: Optional[Number], precision: int
+        self, raw_text: str, numeric_value: Optional[float], key: str
     ) -> str:
         if numeric_value is not None:
-            try:
-                val = float(numeric_value)
-                abs_val = abs(val)
-
-                if (abs_val != 0.0) and (
-                    abs_val >= 10 ** (self.max_number_chars)
-                    or abs_val < 10 ** -(precision + 2)
-                ):
-                    return f"{val:.{precision}e}"
-            except Exception:
-                pass
+            abs_val = abs(numeric_value)
+            if (abs_val != 0.0) and (
+                abs_val >= self._upper_thresh
+                or abs_val < self._get_lower_thresh_for_key(key)
+            ):
+                return f"{numeric_value:.{self._get_precision_for_key(key)}e}"
 
         if len(raw_text) > self.max_number_chars:
             cut = max(1, self.max_number_chars - 3)
             return raw_text[:cut] + "..."
         return raw_text
 
-    def _format_value_html(self, key: str, value: Optional[Number]) -> str:
+    def _format_value(self, key: str, value: Optional[str | Number]) -> Tuple[str, str]:
         if value is None:
             number_text = "-"
             unit_text = ""
             numeric_value = None
         else:
-            p = self._get_precision_for_key(key)
-            numeric_value = None
-            try:
+            if isinstance(value, (int, float)):
                 numeric_value = float(value)
-                number_text = f"{numeric_value:.{p}f}"
-            except (TypeError, ValueError):
-                number_text = str(value)
+                number_text = format(numeric_value, self._get_spec_for_key(key))
+            else:
+                # strings are shown as given
+                numeric_value = None
+                number_text = value
 
             unit_text = self._get_unit_for_key(key) or ""
 
-        number_text = self._shorten_number_text(
-            number_text, numeric_value, self._get_precision_for_key(key)
-        )
-
-        html = (
-            f"<div style='text-align:center;'>"
-            f"  <div style='font-size:32px; font-weight:700; line-height:1;'>{number_text}</div>"
-            f"  <div style='font-size:14px; color:rgba(0,0,0,0.55); margin-top:4px;'>{unit_text}</div>"
-            f"</div>"
-        )
-        return html
+        number_text = self._shorten_number_text(number_text, numeric_value, key)
+        return number_text, unit_text
 
     def setup_gps_graph(self) -> QWidget:
         self.data_grid = QWidget()
         self.data_grid.setMinimumHeight(420)
+        # no paints or layout passes while the cells are being built
+        self.data_grid.setUpdatesEnabled(False)
 
         grid_layout = QGridLayout()
+        grid_layout.setEnabled(False)
         grid_layout.setSpacing(0)
         grid_layout.setContentsMargins(0, 0, 0, 0)
 
@@ -128,28 +154,59 @@ class ValueGrid:
             ["C0", "C1", "C2"],
         ]
 
-        base_font = QFont("Arial", 10, QFont.Weight.Bold)
+        # plain text with fonts set once; no rich-text parsing per update
+        value_font = QFont("Arial")
+        value_font.setPixelSize(32)
+        value_font.setWeight(QFont.Weight.Bold)
+        unit_font = QFont("Arial")
+        unit_font.setPixelSize(14)
 
         for col_index, col_keys in enumerate(cols):
             for row_index, key in enumerate(col_keys):
-                label = QLabel()
-                label.setFont(base_font)
-                label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                label.setFixedHeight(140)
-                label.setFixedWidth(140)
-                label.setTextFormat(Qt.TextFormat.RichText)  # allow HTML
-
-                label.setWordWrap(True)
-                label.setSizePolicy(
+                cell = QWidget()
+                cell.setFixedHeight(140)
+                cell.setFixedWidth(140)
+                cell.setSizePolicy(
                     QSizePolicy.Policy.MinimumExpanding,
                     QSizePolicy.Policy.MinimumExpanding,
                 )
+                cell_layout = QVBoxLayout()
+                cell_layout.setSpacing(4)
+                cell_layout.setContentsMargins(0, 0, 0, 0)
+
+                value_label = QLabel()
+                value_label.setFont(value_font)
+                value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+                value_label.setTextFormat(Qt.TextFormat.PlainText)
+                # single line; overflow is already cut by _shorten_number_text
+                value_label.setTextInteractionFlags(
+                    Qt.TextInteractionFlag.NoTextInteraction
+                )
+
+                unit_label = QLabel()
+                unit_label.setFont(unit_font)
+                unit_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+                unit_label.setTextFormat(Qt.TextFormat.PlainText)
+                unit_label.setTextInteractionFlags(
+                    Qt.TextInteractionFlag.NoTextInteraction
+                )
+                unit_label.setStyleSheet("color: rgba(0, 0, 0, 0.55);")
+
+                cell_layout.addStretch(1)
+                cell_layout.addWidget(value_label)
+                cell_layout.addWidget(unit_label)
+                cell_layout.addStretch(1)
+                cell.setLayout(cell_layout)
 
                 val = self.telemetry_data.get(key) or 0.0
-                label.setText(self._format_value_html(key, val))
+                number_text, unit_text = self._format_value(key, val)
+                value_label.setText(number_text)
+                unit_label.setText(unit_text)
+                self._last_text[key] = number_text
+                self._last_unit[key] = unit_text
 
-                grid_layout.addWidget(label, row_index, col_index)
-                self._labels[key] = label
+                grid_layout.addWidget(cell, row_index, col_index)
+                self._labels[key] = (value_label, unit_label)
 
         # make rows/columns expand evenly
         for r in range(3):
@@ -157,27 +214,46 @@ class ValueGrid:
         for c in range(3):
             grid_layout.setColumnStretch(c, 1)
 
+        grid_layout.setEnabled(True)
         self.data_grid.setLayout(grid_layout)
+        self.data_grid.setUpdatesEnabled(True)
         return self.data_grid
 
     def update_telemetry(self, key: str, value: Optional[str | Number]) -> None:
         if key not in self.telemetry_data:
             return
 
-        self.telemetry_data[key] = value if value is not None else 0.0
+        value = value if value is not None else 0.0
+        if self.telemetry_data[key] == value:
+            return
+        self.telemetry_data[key] = value
         self._refresh_label(key)
 
+    def update_many(self, values: Dict[str, Optional[str | Number]]) -> None:
+        # setText repaints are already merged into one paint per event-loop
+        # pass, and unchanged values never reach a label
+        update = self.update_telemetry
+        for key, value in values.items():
+            update(key, value)
+
     def _refresh_label(self, key: str) -> None:
-        label = self._labels.get(key)
-        if label:
+        labels = self._labels.get(key)
+        if labels:
+            value_label, unit_label = labels
             val = (
                 self.telemetry_data.get(key)
                 if self.telemetry_data.get(key) is not None
                 else 0.0
             )
-            label.setText(self._format_value_html(key, val))
-            label.setToolTip(str(val))
+            value_label.setToolTip(str(val))
+            number_text, unit_text = self._format_value(key, val)
+            if self._last_text.get(key) != number_text:
+                self._last_text[key] = number_text
+                value_label.setText(number_text)
+            if self._last_unit.get(key) != unit_text:
+                self._last_unit[key] = unit_text
+                unit_label.setText(unit_text)
 
     def _refresh_all_labels(self) -> None:
-        for key in list(self._labels.keys()):
+        for key in self._keys:
             self._refresh_label(key)